@@ -6,34 +6,146 @@ Syncs local ~/scripts folder to Git repository
 
 import os
 import sys
-import yaml
+import glob
+import json
+import shlex
 import platform
 import subprocess
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 import shutil
+import tempfile
+
+try:
+    import pygit2
+except ImportError:  # commit through the git CLI instead
+    pygit2 = None
+
+CONFIG_PATH = "git_config.toml"
+# Older installs were configured with YAML, which is still read when present
+LEGACY_CONFIG_PATH = "git_config.yaml"
+
+SAMPLE_CONFIG = """\
+[git]
+repository_url = "https://github.com/yourcompany/scripts-repo.git"
+local_repo_path = "~/scripts-git-repo"
+branch = "main"
+
+[sync]
+exclude_extensions = [".tmp", ".log", ".bak", ".swp", ".DS_Store"]
+verbose = false
+mode = "copy"
+"""
+
+# Marks the end of a command's output in the persistent git shell
+SHELL_SENTINEL = "__GIT_SYNC_END__:"
 
 
 class GitScriptSync:
-    def __init__(self, config_path="git_config.yaml"):
+    def __init__(self, config_path=CONFIG_PATH):
         self.config = self.load_config(config_path)
         self.scripts_path = self.get_scripts_path()
         self.repo_path = Path(self.config['git']['local_repo_path']).expanduser()
+        self.current_user = os.environ.get('USER') or os.environ.get('USERNAME') or 'unknown'
+        self.scripts_manifest = None
+        self.verbose = self.config.get('sync', {}).get('verbose', False)
+        self.excluded_extensions = tuple(self.config.get('sync', {}).get('exclude_extensions', ['.tmp', '.log', '.bak']))
+        self.worktree_mode = self.config.get('sync', {}).get('mode', 'copy') == 'worktree'
+        if self.worktree_mode:
+            # Commit straight from the scripts folder, one branch per user
+            self.git_dir = Path(self.config['git'].get('git_dir', '~/.scripts-sync.git')).expanduser()
+            self.work_tree = self.scripts_path
+            self.branch_name = f"users/{self.current_user}"
+            self.user_pathspec = "."
+        else:
+            self.git_dir = None
+            self.work_tree = self.repo_path
+            self.branch_name = self.config['git'].get('branch', 'main')
+            # Only this user's folder can change, so keep git from scanning the rest
+            self.user_pathspec = self.current_user
+        self._shell = None
+        self._shell_stderr_path = None
         
+    def __del__(self):
+        self.close()
+    
     def load_config(self, config_path):
-        """Load configuration from YAML file"""
+        """Load configuration from TOML file (or a legacy YAML file)"""
         try:
-            with open(config_path, 'r') as file:
-                config = yaml.safe_load(file)
-                return config
+            mtime = os.stat(config_path).st_mtime_ns
+            cache_path = f"{config_path}.{mtime}.json"
+            
+            # Reuse the parsed config if the file hasn't changed since last run
+            if os.path.exists(cache_path):
+                try:
+                    with open(cache_path, 'r') as file:
+                        return json.load(file)
+                except (OSError, ValueError):
+                    pass  # unreadable or corrupt cache, re-parse and rewrite it
+            
+            if config_path.endswith(('.yaml', '.yml')):
+                config = self.load_yaml_config(config_path)
+            else:
+                config = self.load_toml_config(config_path)
+            
+            self.write_config_cache(config_path, cache_path, config)
+            return config
         except FileNotFoundError:
             print(f"❌ Config file '{config_path}' not found!")
-            print("Please create git_config.yaml with your Git settings.")
+            print(f"Please create {CONFIG_PATH} with your Git settings.")
             sys.exit(1)
         except Exception as e:
             print(f"❌ Error loading config: {e}")
             sys.exit(1)
     
+    def load_toml_config(self, config_path):
+        """Parse a TOML config, importing the parser only when needed"""
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            import tomli as tomllib
+        
+        with open(config_path, 'rb') as file:
+            return tomllib.load(file)
+    
+    def load_yaml_config(self, config_path):
+        """Parse a legacy YAML config, importing PyYAML only when needed"""
+        import yaml
+        try:
+            from yaml import CSafeLoader as SafeLoader
+        except ImportError:  # PyYAML built without libyaml
+            from yaml import SafeLoader
+        
+        # Let libyaml decode the raw bytes itself
+        with open(config_path, 'rb') as file:
+            return yaml.load(file, Loader=SafeLoader)
+    
+    def write_config_cache(self, config_path, cache_path, config):
+        """Atomically write the parsed config as JSON and drop stale caches"""
+        tmp_path = f"{cache_path}.tmp"
+        try:
+            with open(tmp_path, 'w') as file:
+                json.dump(config, file)
+            os.replace(tmp_path, cache_path)
+            keep_path = cache_path
+        except (OSError, TypeError, ValueError) as e:
+            # e.g. dates in the config aren't JSON serializable; the config itself is fine
+            print(f"⚠️  Warning: Could not write config cache: {e}")
+            keep_path = None
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        
+        # Purge caches for older versions of the config (and a corrupt current one)
+        for stale_path in glob.glob(f"{glob.escape(config_path)}.*.json"):
+            if stale_path != keep_path:
+                try:
+                    os.remove(stale_path)
+                except OSError:
+                    pass
+    
     def get_scripts_path(self):
         """Get the scripts folder path based on OS"""
         if platform.system() == "Windows":
@@ -41,13 +153,32 @@ class GitScriptSync:
         else:  # Linux/Unix
             return Path.home() / "scripts"
     
+    def git_command(self, *args):
+        """Build a git argv list, pointing git at the detached git dir in worktree mode"""
+        if self.git_dir is None:
+            return ["git", *args]
+        return ["git", "--git-dir", str(self.git_dir), "--work-tree", str(self.work_tree), *args]
+    
     def run_git_command(self, command, cwd=None):
-        """Run git command and return result"""
+        """Run git command and return result
+        
+        command is an argv list run directly; a string is run through the
+        shell (only used for compound commands). On Linux/Unix commands go
+        through one long-lived bash process instead of a new process each.
+        """
+        cwd = cwd or self.work_tree
+        if platform.system() != "Windows":
+            try:
+                return self.run_in_shell(command, cwd)
+            except OSError:
+                # bash missing or the shell died, fall back to a fresh process
+                self.close()
+        
         try:
             result = subprocess.run(
                 command, 
-                shell=True, 
-                cwd=cwd or self.repo_path,
+                shell=isinstance(command, str), 
+                cwd=cwd,
                 capture_output=True, 
                 text=True, 
                 check=True
@@ -56,21 +187,90 @@ class GitScriptSync:
         except subprocess.CalledProcessError as e:
             return False, e.stderr
     
+    def run_in_shell(self, command, cwd):
+        """Run command in the persistent bash shell and return result"""
+        if self._shell is None:
+            fd, self._shell_stderr_path = tempfile.mkstemp(prefix="git-sync-", suffix=".stderr")
+            os.close(fd)
+            self._shell = subprocess.Popen(
+                ["bash", "--noprofile", "--norc"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True
+            )
+        
+        if not isinstance(command, str):
+            command = shlex.join(command)
+        
+        # stdin is detached so git can never read the commands meant for bash
+        self._shell.stdin.write(
+            f"{{ cd {shlex.quote(str(cwd))} && {command}; }} "
+            f"</dev/null 2>{shlex.quote(self._shell_stderr_path)}; "
+            f"printf '\\n{SHELL_SENTINEL}%s\\n' $?\n"
+        )
+        self._shell.stdin.flush()
+        
+        lines = []
+        while True:
+            line = self._shell.stdout.readline()
+            if not line:
+                raise OSError("git shell exited unexpectedly")
+            if line.startswith(SHELL_SENTINEL):
+                returncode = int(line[len(SHELL_SENTINEL):])
+                break
+            lines.append(line)
+        # Drop the newline printed in front of the sentinel
+        output = "".join(lines)[:-1]
+        
+        if returncode != 0:
+            with open(self._shell_stderr_path, 'r') as file:
+                return False, file.read()
+        return True, output
+    
+    def close(self):
+        """Shut down the persistent git shell"""
+        shell = getattr(self, '_shell', None)
+        if shell is not None:
+            self._shell = None
+            try:
+                shell.stdin.close()
+            except OSError:
+                pass
+            shell.wait()
+        stderr_path = getattr(self, '_shell_stderr_path', None)
+        if stderr_path is not None:
+            self._shell_stderr_path = None
+            try:
+                os.remove(stderr_path)
+            except OSError:
+                pass
+    
     def setup_git_repo(self):
         """Clone or initialize Git repository"""
+        if self.worktree_mode:
+            return self.ensure_detached_gitdir()
+        
         repo_url = self.config['git']['repository_url']
+        branch_name = self.branch_name
         
         if self.repo_path.exists():
             print(f"📁 Using existing repo: {self.repo_path}")
+            if self.is_up_to_date(branch_name):
+                print("ℹ️  Repository already up to date")
+                return True
+            
             # Pull latest changes
-            success, output = self.run_git_command("git pull origin main")
+            success, output = self.run_git_command(self.git_command("pull", "--ff-only", "origin", branch_name))
             if not success:
                 print(f"⚠️  Warning: Could not pull latest changes: {output}")
             return True
         else:
             print(f"📥 Cloning repository to: {self.repo_path}")
+            # Only HEAD of the sync branch is needed, so skip history and blobs
             success, output = self.run_git_command(
-                f"git clone {repo_url} {self.repo_path}",
+                ["git", "clone", "--filter=blob:none", "--depth=1", "--single-branch",
+                 "--branch", branch_name, repo_url, str(self.repo_path)],
                 cwd=self.repo_path.parent
             )
             if success:
@@ -80,6 +280,79 @@ class GitScriptSync:
                 print(f"❌ Failed to clone repository: {output}")
                 return False
     
+    def ensure_detached_gitdir(self):
+        """Set up a git dir outside the scripts folder that tracks it directly"""
+        if not self.scripts_path.exists():
+            print(f"❌ Scripts directory not found: {self.scripts_path}")
+            print(f"Please create the directory: {self.scripts_path}")
+            return False
+        
+        if self.git_dir.exists():
+            print(f"📁 Using existing git dir: {self.git_dir}")
+        else:
+            print(f"📥 Initializing git dir {self.git_dir} for {self.scripts_path}")
+            repo_url = self.config['git']['repository_url']
+            for command in (
+                self.git_command("init", "-q"),
+                self.git_command("symbolic-ref", "HEAD", f"refs/heads/{self.branch_name}"),
+                self.git_command("remote", "add", "origin", repo_url),
+            ):
+                success, output = self.run_git_command(command)
+                if not success:
+                    print(f"❌ Failed to initialize git dir: {output}")
+                    shutil.rmtree(self.git_dir, ignore_errors=True)
+                    return False
+            
+            # Continue this user's branch if it already exists on the remote,
+            # leaving the scripts themselves untouched. Only a branch the remote
+            # reports as missing starts fresh; any other failure (e.g. network)
+            # must not leave a git dir whose history is unrelated to the remote.
+            success, output = self.run_git_command(
+                self.git_command("ls-remote", "origin", f"refs/heads/{self.branch_name}")
+            )
+            if not success:
+                print(f"❌ Failed to check remote branch {self.branch_name}: {output}")
+                shutil.rmtree(self.git_dir, ignore_errors=True)
+                return False
+            
+            if output.strip():
+                for command in (
+                    self.git_command("fetch", "--depth=1", "origin", self.branch_name),
+                    self.git_command("update-ref", f"refs/heads/{self.branch_name}", "FETCH_HEAD"),
+                    self.git_command("reset", "-q"),
+                ):
+                    success, output = self.run_git_command(command)
+                    if not success:
+                        print(f"❌ Failed to fetch branch {self.branch_name}: {output}")
+                        shutil.rmtree(self.git_dir, ignore_errors=True)
+                        return False
+            print(f"✅ Git dir ready, syncing to branch {self.branch_name}")
+        
+        self.write_git_excludes()
+        return True
+    
+    def write_git_excludes(self):
+        """Mirror the copy mode rules: only non-hidden app folders, minus excluded extensions"""
+        patterns = ["/*", "!/*/", "/.*"]
+        patterns.extend(f"*{ext}" for ext in self.excluded_extensions)
+        exclude_path = self.git_dir / 'info' / 'exclude'
+        exclude_path.parent.mkdir(exist_ok=True)
+        exclude_path.write_text("\n".join(patterns) + "\n")
+    
+    def is_up_to_date(self, branch_name):
+        """Check whether local HEAD already matches the remote branch"""
+        success, remote_output = self.run_git_command(
+            self.git_command("ls-remote", "origin", f"refs/heads/{branch_name}")
+        )
+        if not success or not remote_output.strip():
+            return False
+        
+        success, local_output = self.run_git_command(self.git_command("rev-parse", "HEAD"))
+        if not success:
+            return False
+        
+        return remote_output.split()[0] == local_output.strip()
+    
     def copy_scripts_to_repo(self):
         """Copy all scripts from local folder to git repo"""
         if not self.scripts_path.exists():
@@ -87,85 +360,285 @@ class GitScriptSync:
             print(f"Please create the directory: {self.scripts_path}")
             return False
         
-        # Get current user for folder organization
-        current_user = os.getenv('USER') or os.getenv('USERNAME') or 'unknown'
-        user_folder_in_repo = self.repo_path / current_user
+        # A tuple lets str.endswith check every extension in one call
+        excluded_extensions = self.excluded_extensions
+        with os.scandir(self.scripts_path) as entries:
+            app_folders = [
+                Path(entry.path) for entry in entries
+                if entry.is_dir() and not entry.name.startswith('.')
+            ]
+        
+        # Skip copying entirely if nothing changed since the last successful sync
+        self.scripts_manifest = self.build_manifest(app_folders, excluded_extensions)
+        if self.scripts_manifest is not None and self.scripts_manifest == self.load_manifest():
+            print("ℹ️  No changes in scripts since last sync")
+            return False
+        
+        # Organize scripts under a per-user folder
+        user_folder_in_repo = self.repo_path / self.current_user
         
         # Create user folder in repo if it doesn't exist
         user_folder_in_repo.mkdir(exist_ok=True)
         
-        print(f"📁 Copying scripts to repo under: {current_user}/")
+        print(f"📁 Copying scripts to repo under: {self.current_user}/")
         
-        excluded_extensions = self.config.get('sync', {}).get('exclude_extensions', ['.tmp', '.log', '.bak'])
         copied_files = 0
         
-        # Walk through all app folders in scripts directory
-        for item in self.scripts_path.iterdir():
-            if item.is_dir() and not item.name.startswith('.'):
-                app_folder = item.name
-                target_app_folder = user_folder_in_repo / app_folder
+        # Sync all app folders in scripts directory concurrently
+        max_workers = (os.cpu_count() or 1) * 2
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.sync_app_folder, item, user_folder_in_repo, excluded_extensions)
+                for item in app_folders
+            ]
+            # Output is collected here and written once, keeping each folder's lines together
+            log = []
+            failed_folders = 0
+            for future in as_completed(futures):
+                count, messages, failed = future.result()
+                log.extend(messages)
+                copied_files += count
+                failed_folders += failed
+        
+        if log:
+            sys.stdout.write("\n".join(log) + "\n")
+        print(f"📄 Total files synced: {copied_files}")
+        
+        # Don't record this state as synced, so failed folders are retried next run
+        if failed_folders:
+            self.scripts_manifest = None
+        return copied_files > 0
+    
+    def build_manifest(self, app_folders, excluded_extensions):
+        """Map each script's path relative to the scripts folder to [size, mtime_ns]
+        
+        Returns None if any part of the tree can't be read (e.g. a dangling
+        symlink), so the copy step runs and reports the problem per folder.
+        """
+        manifest = {}
+        
+        def scan(directory, prefix):
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    relative_path = f"{prefix}/{entry.name}"
+                    if entry.is_dir():
+                        scan(entry.path, relative_path)
+                    elif not entry.name.endswith(excluded_extensions):
+                        stat = entry.stat()
+                        manifest[relative_path] = [stat.st_size, stat.st_mtime_ns]
+        
+        try:
+            for item in app_folders:
+                scan(item, item.name)
+        except OSError:
+            return None
+        return manifest
+    
+    def get_manifest_path(self):
+        """Manifest lives inside .git so it is never committed"""
+        return self.repo_path / '.git' / 'sync-manifest.json'
+    
+    def load_manifest(self):
+        """Load the manifest from the last successful sync, if any"""
+        try:
+            with open(self.get_manifest_path(), 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+    
+    def write_manifest(self, manifest):
+        """Atomically record the manifest of a successful sync"""
+        manifest_path = self.get_manifest_path()
+        tmp_path = f"{manifest_path}.tmp"
+        try:
+            with open(tmp_path, 'w') as file:
+                json.dump(manifest, file)
+            os.replace(tmp_path, manifest_path)
+        except OSError as e:
+            print(f"⚠️  Warning: Could not write sync manifest: {e}")
+    
+    def sync_app_folder(self, item, user_folder_in_repo, excluded_extensions):
+        """Sync a single app folder into the repo, returning (file count, messages, failed)"""
+        app_folder = item.name
+        target_app_folder = user_folder_in_repo / app_folder
+        messages = [f"  📂 Processing app folder: {app_folder}"]
+        
+        # Only copy files that changed since the last sync
+        try:
+            synced_files, updated_files = self.sync_tree(item, target_app_folder, excluded_extensions, messages)
+            messages.append(f"    ✅ Synced app folder: {app_folder} ({updated_files} updated)")
+        except Exception as e:
+            messages.append(f"    ❌ Error copying {app_folder}: {e}")
+            return 0, messages, True
+        
+        return synced_files, messages, False
+    
+    def sync_tree(self, src, dst, excluded_extensions, messages):
+        """Mirror src into dst, copying only new or modified files.
+        
+        Files are compared by size and modification time. Anything in dst
+        that no longer exists in src (or is now excluded) is removed.
+        Returns (file count, updated file count).
+        """
+        os.makedirs(dst, exist_ok=True)
+        # One listing of dst answers every existence/type question below
+        with os.scandir(dst) as entries:
+            existing = {entry.name: entry for entry in entries}
+        kept_names = set()
+        synced_files = 0
+        updated_files = 0
+        
+        with os.scandir(src) as entries:
+            for entry in entries:
+                target = os.path.join(dst, entry.name)
+                existing_entry = existing.get(entry.name)
                 
-                print(f"  📂 Processing app folder: {app_folder}")
+                if entry.is_dir():
+                    if existing_entry is not None and not existing_entry.is_dir(follow_symlinks=False):
+                        os.remove(target)
+                    files, updated = self.sync_tree(entry.path, target, excluded_extensions, messages)
+                    synced_files += files
+                    updated_files += updated
+                    kept_names.add(entry.name)
+                    continue
                 
-                # Remove existing app folder in repo to ensure clean sync
-                if target_app_folder.exists():
-                    shutil.rmtree(target_app_folder)
+                if entry.name.endswith(excluded_extensions):
+                    if self.verbose:
+                        messages.append(f"    🗑️  Excluded: {entry.name}")
+                    continue
                 
-                # Copy the entire app folder
-                try:
-                    shutil.copytree(item, target_app_folder)
-                    
-                    # Remove excluded files
-                    for file_path in target_app_folder.rglob('*'):
-                        if file_path.is_file():
-                            if any(file_path.name.endswith(ext) for ext in excluded_extensions):
-                                file_path.unlink()
-                                print(f"    🗑️  Excluded: {file_path.name}")
-                            else:
-                                copied_files += 1
-                                
-                    print(f"    ✅ Copied app folder: {app_folder}")
-                    
-                except Exception as e:
-                    print(f"    ❌ Error copying {app_folder}: {e}")
-        
-        print(f"📄 Total files copied: {copied_files}")
-        return copied_files > 0
+                kept_names.add(entry.name)
+                synced_files += 1
+                
+                if existing_entry is not None:
+                    if existing_entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(target)
+                    else:
+                        try:
+                            src_stat = entry.stat()
+                            dst_stat = existing_entry.stat()
+                            if (dst_stat.st_size == src_stat.st_size
+                                    and dst_stat.st_mtime_ns == src_stat.st_mtime_ns):
+                                continue
+                        except FileNotFoundError:  # dangling symlink
+                            pass
+                        # Never write through the old entry, it may be a hard link to a source file
+                        os.remove(target)
+                
+                link_or_copy(entry.path, target)
+                updated_files += 1
+        
+        # Remove files and folders that are no longer in the source
+        for name, orphan in existing.items():
+            if name not in kept_names:
+                if orphan.is_dir(follow_symlinks=False):
+                    shutil.rmtree(orphan.path)
+                else:
+                    os.remove(orphan.path)
+        
+        return synced_files, updated_files
+    
+    def get_commit_message(self):
+        """Commit message with timestamp and user"""
+        return f"Auto-sync scripts from {self.current_user} at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
     
     def commit_and_push_changes(self):
         """Commit changes and push to remote repository"""
-        current_user = os.getenv('USER') or os.getenv('USERNAME') or 'unknown'
+        if pygit2 is not None and not self.worktree_mode:
+            try:
+                repo = pygit2.Repository(str(self.repo_path))
+            except pygit2.GitError as e:
+                print(f"⚠️  Warning: pygit2 could not open repo, using git CLI: {e}")
+            else:
+                result = self.commit_and_push_with_pygit2(repo)
+                if result is not None:
+                    return result
         
         # Check if there are any changes
-        success, output = self.run_git_command("git status --porcelain")
+        success, output = self.run_git_command(
+            self.git_command("status", "--porcelain", "--", self.user_pathspec)
+        )
         if not success:
             print(f"❌ Error checking git status: {output}")
             return False
         
         if not output.strip():
-            print("ℹ️  No changes to commit")
-            return True
+            return self.push_unpushed_commits()
         
         print("📝 Changes detected, committing...")
         
-        # Add all changes
-        success, output = self.run_git_command("git add .")
+        # Add, commit and push in a single shell invocation
+        join_command = subprocess.list2cmdline if platform.system() == "Windows" else shlex.join
+        command = " && ".join(join_command(args) for args in [
+            self.git_command("add", "-A", "--", self.user_pathspec),
+            self.git_command("commit", "-m", self.get_commit_message()),
+            self.git_command("push", "origin", self.branch_name),
+        ])
+        success, output = self.run_git_command(command)
         if not success:
-            print(f"❌ Error adding files: {output}")
+            print(f"❌ Error committing or pushing changes: {output}")
             return False
         
-        # Commit with timestamp and user
-        commit_message = f"Auto-sync scripts from {current_user} at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        success, output = self.run_git_command(f'git commit -m "{commit_message}"')
+        print("✅ Changes pushed to remote repository")
+        return True
+    
+    def commit_and_push_with_pygit2(self, repo):
+        """Commit in-process with libgit2, then push with the git CLI
+        
+        Returns None if the commit couldn't be made in-process, so the
+        caller falls back to the git CLI.
+        """
+        try:
+            # Stage this user's folder and compare against HEAD rather than
+            # calling status() first. libgit2 walks the whole work tree either
+            # way (the pathspec only limits what gets staged), so this keeps
+            # it to a single walk.
+            repo.index.add_all([self.user_pathspec])
+            tree = repo.index.write_tree()
+            has_changes = tree != repo.head.peel(pygit2.Commit).tree.id
+            if has_changes:
+                repo.index.write()
+                signature = repo.default_signature
+                repo.create_commit(
+                    'HEAD', signature, signature, self.get_commit_message(), tree, [repo.head.target]
+                )
+        except (pygit2.GitError, KeyError) as e:
+            # e.g. identity only set via GIT_AUTHOR_*/EMAIL, which libgit2 ignores
+            print(f"⚠️  Warning: pygit2 could not commit, using git CLI: {e}")
+            return None
+        
+        if not has_changes:
+            return self.push_unpushed_commits()
+        
+        print("📝 Changes detected, committing...")
+        print("✅ Changes committed")
+        
+        # Push through git so the user's credential helpers and SSH config apply
+        success, output = self.run_git_command(self.git_command("push", "origin", self.branch_name))
         if not success:
-            print(f"❌ Error committing: {output}")
+            print(f"❌ Error pushing to remote: {output}")
             return False
         
-        print("✅ Changes committed")
+        print("✅ Changes pushed to remote repository")
+        return True
+    
+    def push_unpushed_commits(self):
+        """With a clean work tree, push any commit an earlier run failed to push"""
+        success, _ = self.run_git_command(self.git_command("rev-parse", "--verify", "-q", "HEAD"))
+        if not success:
+            print("ℹ️  No changes to commit")
+            return True
+        
+        success, output = self.run_git_command(
+            self.git_command("rev-list", "--count", f"refs/remotes/origin/{self.branch_name}..HEAD")
+        )
+        # No remote-tracking branch means this branch was never pushed
+        if success and output.strip() == "0":
+            print("ℹ️  No changes to commit")
+            return True
         
-        # Push to remote
-        branch_name = self.config['git'].get('branch', 'main')
-        success, output = self.run_git_command(f"git push origin {branch_name}")
+        print("📤 Pushing commits from an earlier run...")
+        success, output = self.run_git_command(self.git_command("push", "origin", self.branch_name))
         if not success:
             print(f"❌ Error pushing to remote: {output}")
             return False
@@ -182,8 +655,10 @@ class GitScriptSync:
         if not self.setup_git_repo():
             return False
         
-        # Step 2: Copy scripts to repo
-        if not self.copy_scripts_to_repo():
+        # Step 2: Copy scripts to repo (worktree mode commits the scripts folder itself)
+        if self.worktree_mode:
+            print(f"📁 Committing scripts directly from: {self.scripts_path}")
+        elif not self.copy_scripts_to_repo():
             print("ℹ️  No scripts to sync")
             return True
         
@@ -191,31 +666,34 @@ class GitScriptSync:
         if not self.commit_and_push_changes():
             return False
         
+        # Only remember the scripts state once it has reached the remote
+        if self.scripts_manifest is not None:
+            self.write_manifest(self.scripts_manifest)
+        
         print("\n" + "=" * 50)
         print(f"🎉 Git sync completed successfully at {datetime.now()}")
         return True
 
 
+def link_or_copy(src, dst):
+    """Hard link src to dst, copying instead when linking isn't possible
+    
+    A hard link shares its contents with the scripts folder, so the repo
+    copy must only ever be replaced, never edited in place.
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
 def create_sample_git_config():
     """Create a sample Git configuration file"""
-    current_user = os.getenv('USER') or os.getenv('USERNAME') or 'user'
-    
-    sample_config = {
-        'git': {
-            'repository_url': 'https://github.com/yourcompany/scripts-repo.git',
-            'local_repo_path': f'~/scripts-git-repo',
-            'branch': 'main'
-        },
-        'sync': {
-            'exclude_extensions': ['.tmp', '.log', '.bak', '.swp', '.DS_Store'],
-        }
-    }
-    
-    with open('git_config.yaml', 'w') as file:
-        yaml.dump(sample_config, file, default_flow_style=False, indent=2)
+    with open(CONFIG_PATH, 'w') as file:
+        file.write(SAMPLE_CONFIG)
     
-    print("📝 Created sample git_config.yaml")
-    print("Please edit git_config.yaml with your Git repository details:")
+    print(f"📝 Created sample {CONFIG_PATH}")
+    print(f"Please edit {CONFIG_PATH} with your Git repository details:")
     print("  - repository_url: Your Git repository URL")
     print("  - local_repo_path: Where to store the local Git repo")
     print("  - branch: Git branch to use (usually 'main')")
@@ -228,12 +706,16 @@ def main():
     """Main entry point"""
     
     # Check if config exists
-    if not os.path.exists('git_config.yaml'):
+    if os.path.exists(CONFIG_PATH):
+        config_path = CONFIG_PATH
+    elif os.path.exists(LEGACY_CONFIG_PATH):
+        config_path = LEGACY_CONFIG_PATH
+    else:
         print("⚠️  Git configuration file not found!")
-        response = input("Create sample git_config.yaml? (y/n): ").lower().strip()
+        response = input(f"Create sample {CONFIG_PATH}? (y/n): ").lower().strip()
         if response == 'y':
             create_sample_git_config()
-            print("\nPlease edit git_config.yaml and run the script again.")
+            print(f"\nPlease edit {CONFIG_PATH} and run the script again.")
             return
         else:
             print("Cannot proceed without configuration.")
@@ -252,7 +734,7 @@ def main():
     
     # Initialize and run sync
     try:
-        syncer = GitScriptSync()
+        syncer = GitScriptSync(config_path)
         success = syncer.sync_to_git()
         
         if success: